@@ -6,9 +6,9 @@ uploads to FTP, and sends Slack notification.
 
 import os
 import sys
-import json
+import orjson
 import tempfile
-import shutil
+from concurrent.futures import ThreadPoolExecutor, wait
 from http.server import BaseHTTPRequestHandler
 
 # Add lib directory to path
@@ -20,12 +20,41 @@ from slack_notify import notify_press_release_ready, notify_error
 from press_release import process_press_release, upload_to_ftp, DEFAULT_CONFIG
 
 
+TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), '..', 'templates')
+
+# Templates are read once per process (i.e. per cold start) and reused
+_TEMPLATE_CACHE: dict[str, str] = {}
+
+
 def load_template(name: str) -> str:
-    """Load an HTML template file."""
-    template_dir = os.path.join(os.path.dirname(__file__), '..', 'templates')
-    template_path = os.path.join(template_dir, name)
-    with open(template_path, 'r', encoding='utf-8') as f:
-        return f.read()
+    """Load an HTML template file, caching its contents for later calls."""
+    template = _TEMPLATE_CACHE.get(name)
+    if template is None:
+        template_path = os.path.join(TEMPLATE_DIR, name)
+        with open(template_path, 'r', encoding='utf-8') as f:
+            template = f.read()
+        _TEMPLATE_CACHE[name] = template
+    return template
+
+
+# Slack notifications are sent off the request path; the HTTP handler waits
+# briefly for them after responding so they aren't lost when the function freezes
+SLACK_FLUSH_TIMEOUT = 2.0
+_slack_pool = ThreadPoolExecutor(max_workers=2)
+_pending_notifications = []
+
+
+def _notify_in_background(notify, *args, **kwargs) -> None:
+    """Queue a Slack notification without blocking the caller."""
+    _pending_notifications.append(_slack_pool.submit(notify, *args, **kwargs))
+
+
+def _flush_notifications(timeout: float = SLACK_FLUSH_TIMEOUT) -> None:
+    """Wait up to `timeout` seconds for queued Slack notifications."""
+    pending = _pending_notifications[:]
+    _pending_notifications.clear()
+    if pending:
+        wait(pending, timeout=timeout)
 
 
 def handler(request):
@@ -42,19 +71,18 @@ def handler(request):
     if request.method != 'POST':
         return {
             'statusCode': 405,
-            'body': json.dumps({'error': 'Method not allowed'})
+            'body': orjson.dumps({'error': 'Method not allowed'})
         }
 
     # Parse webhook payload
     try:
+        # orjson parses bytes and str alike, so no decode step is needed
         body = request.body
-        if isinstance(body, bytes):
-            body = body.decode('utf-8')
-        payload = json.loads(body) if body else {}
-    except json.JSONDecodeError as e:
+        payload = orjson.loads(body) if body else {}
+    except orjson.JSONDecodeError as e:
         return {
             'statusCode': 400,
-            'body': json.dumps({'error': f'Invalid JSON: {e}'})
+            'body': orjson.dumps({'error': f'Invalid JSON: {e}'})
         }
 
     # Extract ticket info
@@ -65,121 +93,119 @@ def handler(request):
     is_valid, missing_fields = validate_parsed_data(ticket_info)
     if not is_valid:
         error_msg = f"Missing required fields: {', '.join(missing_fields)}"
-        notify_error(ticket_key, error_msg)
+        _notify_in_background(notify_error, ticket_key, error_msg)
         return {
             'statusCode': 400,
-            'body': json.dumps({'error': error_msg, 'ticket': ticket_key})
+            'body': orjson.dumps({'error': error_msg, 'ticket': ticket_key})
         }
 
     folder_path = ticket_info['folder_path']
     image_url = ticket_info['image_url']
     subject = ticket_info['subject']
 
-    # Create temp directory for processing
-    temp_dir = tempfile.mkdtemp(prefix='mouser_pr_')
-
-    try:
-        # Download files from Dropbox
-        dropbox = DropboxClient()
-
-        # The folder path from Jira might be relative (e.g., "Mouser/2026-01-19_PR_Name")
-        # or just the folder name. Try to find it.
-        dropbox_path = folder_path
-        if not dropbox_path.startswith('/'):
-            dropbox_path = '/' + dropbox_path
-
-        # Try direct path first
+    # Temp directory for processing, removed when the request finishes
+    with tempfile.TemporaryDirectory(prefix='mouser_pr_', ignore_cleanup_errors=True) as temp_dir:
         try:
-            local_folder = dropbox.download_folder(dropbox_path, temp_dir)
-        except Exception:
-            # Try searching for folder by name
-            folder_name = os.path.basename(folder_path)
-            found_path = dropbox.find_folder_by_name(folder_name)
-            if found_path:
-                local_folder = dropbox.download_folder(found_path, temp_dir)
-            else:
-                raise Exception(f"Could not find folder: {folder_path}")
-
-        # Load templates
-        press_release_template = load_template('press_release.html')
-        email_template = load_template('email.html')
-
-        # Process press release
-        result = process_press_release(
-            folder_path=local_folder,
-            press_release_template=press_release_template,
-            email_template=email_template,
-            image_url=image_url,
-            subject=subject
-        )
-
-        if not result['success']:
-            error_msg = '; '.join(result['errors'])
-            notify_error(ticket_key, error_msg)
+            # Download files from Dropbox
+            dropbox = DropboxClient()
+
+            # The folder path from Jira might be relative (e.g., "Mouser/2026-01-19_PR_Name")
+            # or just the folder name. Try to find it.
+            dropbox_path = folder_path
+            if not dropbox_path.startswith('/'):
+                dropbox_path = '/' + dropbox_path
+
+            # Try direct path first. Files download in the background while
+            # process_press_release starts on the ones that have arrived.
+            local_folder = temp_dir
+            try:
+                downloads = dropbox.iter_download_folder(dropbox_path, local_folder)
+            except Exception:
+                # Try searching for folder by name
+                folder_name = os.path.basename(folder_path)
+                found_path = dropbox.find_folder_by_name(folder_name)
+                if found_path:
+                    downloads = dropbox.iter_download_folder(found_path, local_folder)
+                else:
+                    raise Exception(f"Could not find folder: {folder_path}")
+
+            # Load templates
+            press_release_template = load_template('press_release.html')
+            email_template = load_template('email.html')
+
+            # Process press release
+            result = process_press_release(
+                folder_path=local_folder,
+                press_release_template=press_release_template,
+                email_template=email_template,
+                image_url=image_url,
+                subject=subject,
+                downloads=downloads
+            )
+
+            if not result['success']:
+                error_msg = '; '.join(result['errors'])
+                _notify_in_background(notify_error, ticket_key, error_msg)
+                return {
+                    'statusCode': 500,
+                    'body': orjson.dumps({
+                        'error': 'Processing failed',
+                        'details': result['errors'],
+                        'ticket': ticket_key
+                    })
+                }
+
+            # Upload to FTP
+            upload_result = upload_to_ftp(
+                result['files_to_upload'],
+                DEFAULT_CONFIG,
+                result['folder_name'],
+                result['month_folder']
+            )
+
+            if not upload_result['success']:
+                error_msg = f"FTP upload failed: {upload_result['error']}"
+                _notify_in_background(notify_error, ticket_key, error_msg)
+                return {
+                    'statusCode': 500,
+                    'body': orjson.dumps({
+                        'error': 'Upload failed',
+                        'details': upload_result['error'],
+                        'ticket': ticket_key
+                    })
+                }
+
+            # Send success notification to Slack
+            _notify_in_background(
+                notify_press_release_ready,
+                ticket_key=ticket_key,
+                folder_name=result['folder_name'],
+                preview_urls=result['preview_urls']
+            )
+
             return {
-                'statusCode': 500,
-                'body': json.dumps({
-                    'error': 'Processing failed',
-                    'details': result['errors'],
-                    'ticket': ticket_key
+                'statusCode': 200,
+                'body': orjson.dumps({
+                    'success': True,
+                    'ticket': ticket_key,
+                    'folder': result['folder_name'],
+                    'preview_urls': result['preview_urls'],
+                    'files_uploaded': upload_result['uploaded']
                 })
             }
 
-        # Upload to FTP
-        upload_result = upload_to_ftp(
-            result['files_to_upload'],
-            DEFAULT_CONFIG,
-            result['folder_name'],
-            result['month_folder']
-        )
-
-        if not upload_result['success']:
-            error_msg = f"FTP upload failed: {upload_result['error']}"
-            notify_error(ticket_key, error_msg)
+        except Exception as e:
+            error_msg = str(e)
+            _notify_in_background(notify_error, ticket_key, error_msg)
             return {
                 'statusCode': 500,
-                'body': json.dumps({
-                    'error': 'Upload failed',
-                    'details': upload_result['error'],
+                'body': orjson.dumps({
+                    'error': 'Unexpected error',
+                    'details': error_msg,
                     'ticket': ticket_key
                 })
             }
 
-        # Send success notification to Slack
-        notify_press_release_ready(
-            ticket_key=ticket_key,
-            folder_name=result['folder_name'],
-            preview_urls=result['preview_urls']
-        )
-
-        return {
-            'statusCode': 200,
-            'body': json.dumps({
-                'success': True,
-                'ticket': ticket_key,
-                'folder': result['folder_name'],
-                'preview_urls': result['preview_urls'],
-                'files_uploaded': upload_result['uploaded']
-            })
-        }
-
-    except Exception as e:
-        error_msg = str(e)
-        notify_error(ticket_key, error_msg)
-        return {
-            'statusCode': 500,
-            'body': json.dumps({
-                'error': 'Unexpected error',
-                'details': error_msg,
-                'ticket': ticket_key
-            })
-        }
-
-    finally:
-        # Clean up temp directory
-        if os.path.exists(temp_dir):
-            shutil.rmtree(temp_dir, ignore_errors=True)
-
 
 # Vercel Python runtime handler
 class Handler(BaseHTTPRequestHandler):
@@ -196,15 +222,22 @@ class Handler(BaseHTTPRequestHandler):
 
         self.send_response(result['statusCode'])
         self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(result['body'])))
         self.end_headers()
-        self.wfile.write(result['body'].encode())
+        self.wfile.write(result['body'])
+        self.wfile.flush()
+
+        # Response is out; now let any Slack notification finish
+        _flush_notifications()
 
     def do_GET(self):
         # Health check endpoint
+        body = orjson.dumps({
+            'status': 'ok',
+            'service': 'mouser-press-release-automation'
+        })
         self.send_response(200)
         self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
         self.end_headers()
-        self.wfile.write(json.dumps({
-            'status': 'ok',
-            'service': 'mouser-press-release-automation'
-        }).encode())
+        self.wfile.write(body)
@@ -2,9 +2,18 @@
 Dropbox API client for downloading press release folders.
 """
 import os
+import json
+import shutil
 import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import requests
-from typing import Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Iterator, Optional
+
+
+# Bytes copied per read/write when streaming downloads to disk
+DOWNLOAD_CHUNK_SIZE = int(os.environ.get('DROPBOX_DL_CHUNK', 1024 * 1024))
 
 
 class DropboxClient:
@@ -18,12 +27,31 @@ class DropboxClient:
         self.base_url = "https://api.dropboxapi.com/2"
         self.content_url = "https://content.dropboxapi.com/2"
 
-    def _headers(self) -> dict:
-        return {
+        # Reuse TCP/TLS connections across calls (and download threads).
+        # Every endpoint used here is a read-only POST, so retrying is safe.
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=None,
+                raise_on_status=False
+            )
+        )
+        self.session.mount("https://api.dropboxapi.com", adapter)
+        self.session.mount("https://content.dropboxapi.com", adapter)
+
+        self._json_headers = {
             "Authorization": f"Bearer {self.access_token}",
             "Content-Type": "application/json"
         }
 
+    def _headers(self) -> dict:
+        return self._json_headers
+
     def list_folder(self, path: str) -> list[dict]:
         """
         List contents of a Dropbox folder.
@@ -38,7 +66,7 @@ class DropboxClient:
         if not path.startswith('/'):
             path = '/' + path
 
-        response = requests.post(
+        response = self.session.post(
             f"{self.base_url}/files/list_folder",
             headers=self._headers(),
             json={"path": path}
@@ -59,66 +87,146 @@ class DropboxClient:
         Returns:
             Local file path
         """
-        import json
-
         headers = {
             "Authorization": f"Bearer {self.access_token}",
             "Dropbox-API-Arg": json.dumps({"path": dropbox_path})
         }
 
-        response = requests.post(
+        response = self.session.post(
             f"{self.content_url}/files/download",
             headers=headers,
             stream=True
         )
         response.raise_for_status()
 
-        with open(local_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+        # Copy the raw stream in large blocks rather than small iter_content chunks
+        response.raw.decode_content = True
+        with open(local_path, 'wb', buffering=DOWNLOAD_CHUNK_SIZE) as f:
+            shutil.copyfileobj(response.raw, f, length=DOWNLOAD_CHUNK_SIZE)
 
         return local_path
 
-    def download_folder(self, dropbox_path: str, local_dir: Optional[str] = None) -> str:
+    def iter_download_folder(self, dropbox_path: str, local_dir: str) -> Iterator[str]:
         """
-        Download all files from a Dropbox folder.
+        Download all files from a Dropbox folder, yielding each as it lands.
+
+        The folder is listed immediately, so a bad path raises here rather
+        than on first iteration. Downloads run concurrently; iterating
+        yields local file paths in completion order so callers can start
+        work on early files while later ones are still in flight.
 
         Args:
             dropbox_path: Dropbox folder path (e.g., "Mouser/2026-01-19_PR")
-            local_dir: Local directory to save files (creates temp if None)
+            local_dir: Local directory to save files (created if missing)
 
         Returns:
-            Path to local directory containing downloaded files
+            Iterator of local file paths
         """
         # Normalize path
         if not dropbox_path.startswith('/'):
             dropbox_path = '/' + dropbox_path
 
+        os.makedirs(local_dir, exist_ok=True)
+
+        # List files up front so lookup errors surface to the caller now
+        entries = self.list_folder(dropbox_path)
+        file_entries = [entry for entry in entries if entry.get('.tag') == 'file']
+
+        return self._iter_downloads(file_entries, local_dir)
+
+    def _iter_downloads(self, file_entries: list[dict], local_dir: str) -> Iterator[str]:
+        """Download listed files concurrently, yielding paths as they finish."""
+        if not file_entries:
+            return
+
+        # Downloads are latency-bound, so fetch files concurrently
+        max_workers = int(os.environ.get('DROPBOX_PARALLEL', '16'))
+        max_workers = max(1, min(max_workers, len(file_entries)))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    self.download_file,
+                    entry['path_display'],
+                    os.path.join(local_dir, entry['name'])
+                )
+                for entry in file_entries
+            ]
+            for future in as_completed(futures):
+                # Surface per-file failures to the caller
+                yield future.result()
+
+    def download_folder(self, dropbox_path: str, local_dir: Optional[str] = None) -> str:
+        """
+        Download all files from a Dropbox folder.
+
+        Args:
+            dropbox_path: Dropbox folder path (e.g., "Mouser/2026-01-19_PR")
+            local_dir: Local directory to save files (creates temp if None)
+
+        Returns:
+            Path to local directory containing downloaded files
+        """
         # Create local directory
         if local_dir is None:
             local_dir = tempfile.mkdtemp(prefix="mouser_pr_")
-        else:
-            os.makedirs(local_dir, exist_ok=True)
 
-        # List and download files
-        entries = self.list_folder(dropbox_path)
+        for _ in self.iter_download_folder(dropbox_path, local_dir):
+            pass
 
-        downloaded_files = []
-        for entry in entries:
-            if entry.get('.tag') == 'file':
-                filename = entry['name']
-                dropbox_file_path = entry['path_display']
-                local_file_path = os.path.join(local_dir, filename)
+        return local_dir
 
-                self.download_file(dropbox_file_path, local_file_path)
-                downloaded_files.append(filename)
+    def search_folder(self, folder_name: str, search_path: str = "/Mouser") -> Optional[str]:
+        """
+        Find a folder by partial name match with a single search_v2 call.
 
-        return local_dir
+        Args:
+            folder_name: Folder name to search for
+            search_path: Root path to search in
+
+        Returns:
+            Full Dropbox path of the best match if found, None otherwise
+        """
+        if not search_path.startswith('/'):
+            search_path = '/' + search_path
+
+        response = self.session.post(
+            f"{self.base_url}/files/search_v2",
+            headers=self._headers(),
+            json={
+                "query": folder_name,
+                "options": {
+                    "path": search_path,
+                    "filename_only": True,
+                    "max_results": 20
+                }
+            }
+        )
+        response.raise_for_status()
+
+        candidates = []
+        for match in response.json().get('matches', []):
+            metadata = match.get('metadata', {}).get('metadata', {})
+            if metadata.get('.tag') == 'folder' and folder_name in metadata.get('name', ''):
+                candidates.append(metadata)
+
+        if not candidates:
+            return None
+
+        # Prefer an exact name match, then the shallowest folder
+        best = min(
+            candidates,
+            key=lambda m: (m['name'] != folder_name, m['path_display'].count('/'))
+        )
+        return best['path_display']
 
     def find_folder_by_name(self, folder_name: str, search_path: str = "/Mouser") -> Optional[str]:
         """
         Search for a folder by partial name match.
 
+        Uses search_v2 first; falls back to scanning the root and its
+        immediate subfolders (month folders) if search finds nothing.
+
         Args:
             folder_name: Folder name to search for
             search_path: Root path to search in
@@ -126,6 +234,13 @@ class DropboxClient:
         Returns:
             Full Dropbox path if found, None otherwise
         """
+        try:
+            found = self.search_folder(folder_name, search_path)
+            if found:
+                return found
+        except Exception as e:
+            print(f"Folder search failed, scanning instead: {e}")
+
         try:
             entries = self.list_folder(search_path)
 
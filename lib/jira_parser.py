@@ -5,7 +5,24 @@ import re
 from typing import Optional
 
 
-def parse_jira_ticket(description: str) -> dict:
+# Field group name -> position in parse_jira_ticket's result
+_FIELD_INDEX = {
+    'folder_path': 0,
+    'image_url': 1,
+    'subject': 2,
+}
+
+# One pattern for all labels so the description is scanned only once;
+# each label captures its value in a group named after the field
+_FIELDS_RE = re.compile(
+    r'FILES ON SERVER:\s*(?P<folder_path>.+?)(?:\n|$)'
+    r'|LINK EMBEDDED IMAGE TO:\s*(?P<image_url>.+?)(?:\n|$)'
+    r'|EMAIL SUBJECT LINE:\s*(?P<subject>.+?)(?:\n|$)',
+    re.IGNORECASE
+)
+
+
+def parse_jira_ticket(description: str) -> tuple[Optional[str], Optional[str], Optional[str]]:
     """
     Extract key fields from Jira ticket description.
 
@@ -14,43 +31,18 @@ def parse_jira_ticket(description: str) -> dict:
     - LINK EMBEDDED IMAGE TO: tracking URL for image
     - EMAIL SUBJECT LINE: email subject
 
-    Returns dict with: folder_path, image_url, subject
+    Returns tuple of (folder_path, image_url, subject); missing fields are None
     """
-    result = {
-        'folder_path': None,
-        'image_url': None,
-        'subject': None,
-        'raw_description': description
-    }
+    values = [None, None, None]
+
+    # First occurrence of each field wins
+    for match in _FIELDS_RE.finditer(description):
+        field = match.lastgroup
+        index = _FIELD_INDEX[field]
+        if values[index] is None:
+            values[index] = match.group(field).strip()
 
-    # Extract FILES ON SERVER (folder path)
-    folder_match = re.search(
-        r'FILES ON SERVER:\s*(.+?)(?:\n|$)',
-        description,
-        re.IGNORECASE
-    )
-    if folder_match:
-        result['folder_path'] = folder_match.group(1).strip()
-
-    # Extract LINK EMBEDDED IMAGE TO (tracking URL)
-    image_url_match = re.search(
-        r'LINK EMBEDDED IMAGE TO:\s*(.+?)(?:\n|$)',
-        description,
-        re.IGNORECASE
-    )
-    if image_url_match:
-        result['image_url'] = image_url_match.group(1).strip()
-
-    # Extract EMAIL SUBJECT LINE
-    subject_match = re.search(
-        r'EMAIL SUBJECT LINE:\s*(.+?)(?:\n|$)',
-        description,
-        re.IGNORECASE
-    )
-    if subject_match:
-        result['subject'] = subject_match.group(1).strip()
-
-    return result
+    return tuple(values)
 
 
 def validate_parsed_data(data: dict) -> tuple[bool, list[str]]:
@@ -84,16 +76,16 @@ def extract_ticket_info_from_webhook(payload: dict) -> dict:
     issue = payload.get('issue', {})
     fields = issue.get('fields', {})
 
-    ticket_info = {
-        'key': issue.get('key', 'Unknown'),
-        'title': fields.get('summary', ''),
-        'description': fields.get('description', '') or ''
-    }
+    description = fields.get('description', '') or ''
 
     # Parse the description to extract our fields
-    parsed = parse_jira_ticket(ticket_info['description'])
+    folder_path, image_url, subject = parse_jira_ticket(description)
 
     return {
-        **ticket_info,
-        **parsed
+        'key': issue.get('key', 'Unknown'),
+        'title': fields.get('summary', ''),
+        'description': description,
+        'folder_path': folder_path,
+        'image_url': image_url,
+        'subject': subject
     }
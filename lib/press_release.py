@@ -3,15 +3,21 @@ Press Release Processing Module (Serverless-adapted)
 Processes press release folders and generates HTML files.
 """
 
+import functools
 import os
+import queue
 import re
+import socket
 import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
-from ftplib import FTP
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+from ftplib import FTP, all_errors, error_perm
 
 from docx import Document
 from docx.oxml.ns import qn
+from docx.text.paragraph import Paragraph
+from lxml import etree
 from PIL import Image, ImageFilter
 
 
@@ -25,11 +31,13 @@ DEFAULT_CONFIG = {
         "port": 21,
         "username": os.environ.get("FTP_USER"),
         "password": os.environ.get("FTP_PASS"),
-        "base_remote_path": "/Mouser/{month_folder}/{folder_name}/"
+        "base_remote_path": "/Mouser/{month_folder}/{folder_name}/",
+        "parallel_connections": int(os.environ.get("FTP_PARALLEL", 4))
     },
     "image_settings": {
         "output_width": 336,
-        "jpeg_quality": 95
+        "jpeg_quality": 95,
+        "jpeg_optimize": True
     },
     "urls": {
         "base_url": "https://pr.ezwire.com/Mouser/{month_folder}/{folder_name}/"
@@ -57,6 +65,34 @@ DEFAULT_CONFIG = {
 # DOCUMENT PARSING
 # ============================================================================
 
+# WordprocessingML tags in Clark notation, resolved once for lxml's iter()
+_W_P = qn('w:p')
+_W_R = qn('w:r')
+_W_HYPERLINK = qn('w:hyperlink')
+_R_ID = qn('r:id')
+
+# Compiled once; most paragraphs have no links and skip the offset walk
+_HAS_HYPERLINK = etree.XPath(
+    'boolean(w:hyperlink[@r:id])',
+    namespaces={
+        'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
+        'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+    }
+)
+
+_MONTHS = 'January|February|March|April|May|June|July|August|September|October|November|December'
+_DATE_PREFIX_RE = re.compile(rf'^(?:{_MONTHS})\s+\d')
+_DATE_RE = re.compile(rf'^((?:{_MONTHS})\s+\d{{1,2}},\s+\d{{4}})')
+_TAG_RE = re.compile(r'<[^>]+>')
+_KEYWORD_RE = re.compile(r'\b[A-Z][a-zA-Z0-9-]+\b')
+
+# "– 30 –" end-of-release markers
+_END_MARKERS = frozenset({'– 30 –', '- 30 -'})
+# Paragraph styles that can carry the headline
+_HEADLINE_STYLES = frozenset({'Title', 'Title2', 'Heading 1'})
+
+
+@functools.lru_cache(maxsize=512)
 def clean_url(url: str) -> str:
     """Remove tracking parameters from URLs for display."""
     if not url:
@@ -66,59 +102,55 @@ def clean_url(url: str) -> str:
     return url
 
 
-def extract_hyperlinks(paragraph) -> Dict[str, str]:
-    """Extract hyperlinks from a paragraph, mapping text to URLs."""
-    hyperlinks = {}
-    p_xml = paragraph._element
+def extract_hyperlinks(paragraph) -> List[Tuple[int, int, str]]:
+    """
+    Extract hyperlinks from a paragraph as (offset, length, url) tuples.
 
-    for hyperlink in p_xml.findall('.//w:hyperlink', {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'}):
-        r_id = hyperlink.get(qn('r:id'))
-        if r_id:
-            try:
-                rel = paragraph.part.rels.get(r_id)
-                if rel and rel.target_ref:
-                    link_text = ''.join(
-                        node.text for node in hyperlink.findall('.//w:t', {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'})
-                        if node.text
-                    )
-                    if link_text:
-                        hyperlinks[link_text] = rel.target_ref
-            except Exception:
-                pass
+    Offsets index into paragraph.text, which python-docx builds from the
+    same direct w:r / w:hyperlink children walked here.
+    """
+    hyperlinks = []
+    p_xml = paragraph._element
+    if not _HAS_HYPERLINK(p_xml):
+        return hyperlinks
+
+    rels = None
+    offset = 0
+
+    for child in p_xml.iterchildren(_W_R, _W_HYPERLINK):
+        child_text = child.text
+        if child.tag == _W_HYPERLINK and child_text:
+            r_id = child.get(_R_ID)
+            if r_id:
+                try:
+                    if rels is None:
+                        rels = paragraph.part.rels
+                    rel = rels.get(r_id)
+                    if rel and rel.target_ref:
+                        hyperlinks.append((offset, len(child_text), rel.target_ref))
+                except Exception:
+                    pass
+        offset += len(child_text)
 
     return hyperlinks
 
 
 def get_paragraph_html(paragraph, include_links: bool = True) -> str:
     """Convert a paragraph to HTML, preserving formatting and links."""
-    hyperlinks = extract_hyperlinks(paragraph) if include_links else {}
+    hyperlinks = extract_hyperlinks(paragraph) if include_links else []
     text = paragraph.text
 
-    if hyperlinks and include_links:
-        link_positions = []
-        for link_text, url in hyperlinks.items():
-            pos = text.find(link_text)
-            if pos >= 0:
-                link_positions.append((pos, len(link_text), link_text, url))
-
-        link_positions.sort(key=lambda x: (-x[0], -x[1]))
-        linked_ranges = []
-        result_text = text
-
-        for pos, length, link_text, url in link_positions:
-            overlaps = False
-            for start, end in linked_ranges:
-                if not (pos + length <= start or pos >= end):
-                    overlaps = True
-                    break
-
-            if not overlaps:
-                clean = clean_url(url)
-                link_html = f'<a href="{clean}" target="_blank">{link_text}</a>'
-                result_text = result_text[:pos] + link_html + result_text[pos + length:]
-                linked_ranges.append((pos, pos + length))
+    if hyperlinks:
+        # Offsets come in document order and never overlap
+        parts = []
+        cursor = 0
+        for offset, length, url in hyperlinks:
+            parts.append(text[cursor:offset])
+            parts.append(f'<a href="{clean_url(url)}" target="_blank">{text[offset:offset + length]}</a>')
+            cursor = offset + length
+        parts.append(text[cursor:])
 
-        return result_text
+        return ''.join(parts)
 
     return text
 
@@ -141,42 +173,57 @@ def parse_docx(file_path: str) -> Dict:
     current_section = 'body'
     current_about_title = None
 
-    for para in doc.paragraphs:
+    # Bound to locals for the loop and written back to result afterwards
+    headline = ''
+    subheadline = ''
+    date = ''
+    product_link = ''
+    body_paragraphs = result['body_paragraphs']
+    about_sections = result['about_sections']
+
+    # Style id -> name; resolving a style walks the styles part every time
+    style_names = {}
+
+    # Walk body paragraphs lazily instead of building the doc.paragraphs list
+    for p_xml in doc.element.body.iterchildren(_W_P):
+        para = Paragraph(p_xml, doc.part)
         text = para.text.strip()
-        style_name = para.style.name if para.style else 'Normal'
 
-        if not text:
+        if not text or text in _END_MARKERS:
             continue
 
-        if text in ['– 30 –', '- 30 -']:
-            continue
+        style_id = p_xml.style
+        style_name = style_names.get(style_id)
+        if style_name is None:
+            style_name = para.style.name if para.style else 'Normal'
+            style_names[style_id] = style_name
 
-        if style_name == 'Title' or (style_name == 'Title2' and not result['headline']):
-            if 'New Product Announcement' in text:
+        if style_name in _HEADLINE_STYLES:
+            if style_name == 'Title' or (style_name == 'Title2' and not headline):
+                if 'New Product Announcement' in text:
+                    continue
+                headline = text
                 continue
-            result['headline'] = text
-            continue
 
-        if not result['headline'] and style_name in ['Title', 'Heading 1'] and len(text) > 20:
-            result['headline'] = text
-            continue
+            if not headline and style_name == 'Heading 1' and len(text) > 20:
+                headline = text
+                continue
 
-        if result['headline'] and not result['subheadline'] and not result['body_paragraphs']:
+        if headline and not subheadline and not body_paragraphs:
             if style_name == 'Subtitle':
-                result['subheadline'] = text
+                subheadline = text
                 continue
             has_italic = any(run.italic for run in para.runs if run.text.strip())
-            if has_italic and len(text) < 200 and text != result['headline']:
-                if not re.match(r'^(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d', text):
-                    result['subheadline'] = text
+            if has_italic and len(text) < 200 and text != headline:
+                if not _DATE_PREFIX_RE.match(text):
+                    subheadline = text
                     continue
 
-        if style_name == 'Heading 1' or text.startswith('About '):
-            if text.startswith('About '):
-                current_section = 'about'
-                current_about_title = text
-                result['about_sections'][current_about_title] = []
-                continue
+        if text.startswith('About '):
+            current_section = 'about'
+            current_about_title = text
+            about_sections[current_about_title] = []
+            continue
 
         if 'Trademarks' in text and (style_name == 'Heading 1' or text.startswith('Trademarks')):
             current_section = 'trademarks'
@@ -187,30 +234,36 @@ def parse_docx(file_path: str) -> Dict:
 
         if current_section == 'about' and current_about_title:
             para_html = get_paragraph_html(para)
-            result['about_sections'][current_about_title].append(para_html)
+            about_sections[current_about_title].append(para_html)
         elif current_section == 'body':
             para_html = get_paragraph_html(para)
 
-            date_match = re.match(r'^((?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},\s+\d{4})', para_html)
-            if date_match and not result['date']:
-                result['date'] = date_match.group(1)
+            if not date:
+                date_match = _DATE_RE.match(para_html)
+                if date_match:
+                    date = date_match.group(1)
 
-            if not result['product_link']:
+            if not product_link:
                 links = extract_hyperlinks(para)
-                for url in links.values():
+                for _, _, url in links:
                     if 'mouser.com' in url and '/new/' in url:
-                        result['product_link'] = clean_url(url)
+                        product_link = clean_url(url)
                         break
 
-            result['body_paragraphs'].append(para_html)
+            body_paragraphs.append(para_html)
+
+    result['headline'] = headline
+    result['subheadline'] = subheadline
+    result['date'] = date
+    result['product_link'] = product_link
 
     if result['body_paragraphs']:
         first_para = result['body_paragraphs'][0]
-        clean_text = re.sub(r'<[^>]+>', '', first_para)
+        clean_text = _TAG_RE.sub('', first_para)
         result['meta_description'] = clean_text[:160].rsplit(' ', 1)[0] + '...' if len(clean_text) > 160 else clean_text
 
     if result['headline']:
-        words = re.findall(r'\b[A-Z][a-zA-Z0-9-]+\b', result['headline'])
+        words = _KEYWORD_RE.findall(result['headline'])
         result['meta_keywords'] = ', '.join(words[:10]).lower()
 
     return result
@@ -220,11 +273,60 @@ def parse_docx(file_path: str) -> Dict:
 # IMAGE PROCESSING
 # ============================================================================
 
+# Unsharp mask applied after resizing (Pillow UnsharpMask parameters)
+_SHARPEN_RADIUS = 1.5
+_SHARPEN_PERCENT = 120
+_SHARPEN_THRESHOLD = 2
+
+_LANCZOS = Image.Resampling.LANCZOS
+
+
+def _convert_with_pillow(
+    png_path: str,
+    output_path: str,
+    target_width: int,
+    jpeg_quality: int,
+    jpeg_optimize: bool
+) -> Tuple[int, int]:
+    """Flatten, resize, sharpen and save a PNG as JPEG using Pillow."""
+    with Image.open(png_path) as img:
+        ratio = target_width / img.width
+        new_height = int(img.height * ratio)
+
+        if img.mode in ('RGBA', 'LA', 'P'):
+            rgb_img = Image.new('RGB', img.size, (255, 255, 255))
+            if img.mode == 'P':
+                img = img.convert('RGBA')
+            if img.mode in ('RGBA', 'LA'):
+                rgb_img.paste(img, mask=img.split()[-1])
+            else:
+                rgb_img.paste(img)
+            img = rgb_img
+        elif img.mode != 'RGB':
+            img = img.convert('RGB')
+
+        # Box-reduce large sources first so LANCZOS only runs on a small image
+        factor = img.width // (target_width * 2)
+        if factor > 1:
+            img = img.reduce(factor)
+
+        resized = img.resize((target_width, new_height), _LANCZOS)
+        sharpened = resized.filter(ImageFilter.UnsharpMask(
+            radius=_SHARPEN_RADIUS,
+            percent=_SHARPEN_PERCENT,
+            threshold=_SHARPEN_THRESHOLD
+        ))
+        sharpened.save(output_path, 'JPEG', quality=jpeg_quality, optimize=jpeg_optimize)
+
+    return target_width, new_height
+
+
 def convert_png_to_jpg(
     png_path: str,
     output_path: str,
     target_width: int = 336,
-    jpeg_quality: int = 95
+    jpeg_quality: int = 95,
+    jpeg_optimize: bool = True
 ) -> Dict:
     """Convert PNG to JPG with resizing."""
     result = {
@@ -235,28 +337,8 @@ def convert_png_to_jpg(
     }
 
     try:
-        with Image.open(png_path) as img:
-            ratio = target_width / img.width
-            new_height = int(img.height * ratio)
-
-            if img.mode in ('RGBA', 'LA', 'P'):
-                rgb_img = Image.new('RGB', img.size, (255, 255, 255))
-                if img.mode == 'P':
-                    img = img.convert('RGBA')
-                if img.mode in ('RGBA', 'LA'):
-                    rgb_img.paste(img, mask=img.split()[-1])
-                else:
-                    rgb_img.paste(img)
-                img = rgb_img
-            elif img.mode != 'RGB':
-                img = img.convert('RGB')
-
-            resized = img.resize((target_width, new_height), Image.Resampling.LANCZOS)
-            sharpened = resized.filter(ImageFilter.UnsharpMask(radius=1.5, percent=120, threshold=2))
-            sharpened.save(output_path, 'JPEG', quality=jpeg_quality, optimize=True)
-
-            result['success'] = True
-            result['dimensions'] = (target_width, new_height)
+        result['dimensions'] = _convert_with_pillow(png_path, output_path, target_width, jpeg_quality, jpeg_optimize)
+        result['success'] = True
 
     except Exception as e:
         result['error'] = str(e)
@@ -268,26 +350,117 @@ def convert_png_to_jpg(
 # HTML GENERATION
 # ============================================================================
 
+_SPACE_ESCAPE = str.maketrans({' ': '%20'})
+
+
+def _url_escape(value: str) -> str:
+    """Escape spaces for use in a URL path segment."""
+    return value.translate(_SPACE_ESCAPE)
+
+
+def _build_base_url(config: Dict, month_folder: str, folder_name: str) -> str:
+    """Public URL of a release's remote folder, with a trailing slash."""
+    return config['urls']['base_url'].format(
+        month_folder=_url_escape(month_folder),
+        folder_name=_url_escape(folder_name)
+    )
+
+
+_PLACEHOLDER_RE = re.compile(r'\{\{(\w+)\}\}')
+
+
+@functools.lru_cache(maxsize=16)
+def _compile_template(template: str) -> Tuple[Tuple[str, ...], Tuple[Tuple[str, str], ...]]:
+    """
+    Split a template into its literal text and placeholders.
+
+    Returns (literals, placeholders) where placeholders holds
+    (name, original_token) pairs and len(literals) == len(placeholders) + 1.
+    """
+    pieces = _PLACEHOLDER_RE.split(template)
+    names = pieces[1::2]
+    return tuple(pieces[0::2]), tuple((name, f'{{{{{name}}}}}') for name in names)
+
+
+def render_template(template: str, replacements: Dict[str, str]) -> str:
+    """
+    Fill {{name}} placeholders in a template.
+
+    The template is parsed once and cached; rendering interleaves the
+    cached literals with the looked-up values using list slicing, so the
+    per-placeholder work is a single dict lookup. Unknown placeholders are
+    left as-is; substituted values are not re-scanned for placeholders.
+    """
+    literals, placeholders = _compile_template(template)
+    get = replacements.get
+    parts = [None] * (2 * len(literals) - 1)
+    parts[0::2] = literals
+    parts[1::2] = [get(name, token) for name, token in placeholders]
+    return ''.join(parts)
+
+
+_CONTACT_ROLES = ('marketing', 'press')
+_CONTACT_FIELDS = ('name', 'company', 'title', 'phone', 'email')
+
+
+def _contact_items(contacts: Dict) -> Tuple[Tuple[str, str], ...]:
+    """Contact placeholder/value pairs, hashable for use as a cache key."""
+    return tuple(
+        (f'contact_{role}_{field}', contacts[role][field])
+        for role in _CONTACT_ROLES
+        for field in _CONTACT_FIELDS
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _bake_contacts(template: str, contact_items: Tuple[Tuple[str, str], ...]) -> str:
+    """Fill the contact placeholders, which only change with the config."""
+    return render_template(template, dict(contact_items))
+
+
+@functools.lru_cache(maxsize=256)
+def _month_folder_from_date(date_str: str) -> Optional[str]:
+    """Month folder for a 'January 19, 2026' style date, or None if unparseable."""
+    try:
+        date_obj = datetime.strptime(date_str, "%B %d, %Y")
+    except ValueError:
+        return None
+    return f"{date_obj.year}-{date_obj.month:02d} - Mouser"
+
+
 def generate_month_folder(date_str: str = None) -> str:
     """Generate month folder name like '2026-01 - Mouser'."""
     if date_str:
-        try:
-            date_obj = datetime.strptime(date_str, "%B %d, %Y")
-            return f"{date_obj.year}-{date_obj.month:02d} - Mouser"
-        except ValueError:
-            pass
+        # strptime is slow and the same date is resolved several times per release
+        month_folder = _month_folder_from_date(date_str)
+        if month_folder:
+            return month_folder
     now = datetime.now()
     return f"{now.year}-{now.month:02d} - Mouser"
 
 
+_EMAIL_P_STYLE = 'font:14px Helvetica, Arial, sans-serif; line-height: 20px;'
+_EMAIL_H2_STYLE = 'font:16px Helvetica, Arial, sans-serif; line-height: 20px; font-weight: bold;'
+_WEB_INDENT = ' ' * 20
+
+# (paragraph open, paragraph close, heading open, heading close)
+_EMAIL_TAGS = (f'<p style="{_EMAIL_P_STYLE}">', '</p>', f'<h2 style="{_EMAIL_H2_STYLE}"><u>', '</u></h2>')
+_WEB_TAGS = (f'{_WEB_INDENT}<p>', '</p>', f'{_WEB_INDENT}<h1><u>', '</u></h1>')
+
+
+def _join_paragraphs(paragraphs: list, p_open: str, p_close: str) -> str:
+    """Wrap each paragraph in tags, one per line, with a single join."""
+    if not paragraphs:
+        return ''
+    if len(paragraphs) == 1:
+        return f'{p_open}{paragraphs[0]}{p_close}'
+    return p_open + f'{p_close}\n{p_open}'.join(paragraphs) + p_close
+
+
 def format_body_paragraphs(paragraphs: list, for_email: bool = False) -> str:
     """Format body paragraphs as HTML."""
-    if for_email:
-        return '\n'.join(
-            f'<p style="font:14px Helvetica, Arial, sans-serif; line-height: 20px;">{p}</p>'
-            for p in paragraphs
-        )
-    return '\n'.join(f'                    <p>{p}</p>' for p in paragraphs)
+    p_open, p_close, _, _ = _EMAIL_TAGS if for_email else _WEB_TAGS
+    return _join_paragraphs(paragraphs, p_open, p_close)
 
 
 def format_about_sections(about_sections: Dict, for_email: bool = False) -> str:
@@ -295,38 +468,41 @@ def format_about_sections(about_sections: Dict, for_email: bool = False) -> str:
     if not about_sections:
         return ''
 
+    p_open, p_close, h_open, h_close = _EMAIL_TAGS if for_email else _WEB_TAGS
+
+    if len(about_sections) == 1:
+        (title, paragraphs), = about_sections.items()
+        heading = f'{h_open}{title}{h_close}'
+        if not paragraphs:
+            return heading
+        return f'{heading}\n{_join_paragraphs(paragraphs, p_open, p_close)}'
+
     formatted = []
     for title, paragraphs in about_sections.items():
-        if for_email:
-            formatted.append(f'<h2 style="font:16px Helvetica, Arial, sans-serif; line-height: 20px; font-weight: bold;"><u>{title}</u></h2>')
-            for para in paragraphs:
-                formatted.append(f'<p style="font:14px Helvetica, Arial, sans-serif; line-height: 20px;">{para}</p>')
-        else:
-            formatted.append(f'                    <h1><u>{title}</u></h1>')
-            for para in paragraphs:
-                formatted.append(f'                    <p>{para}</p>')
+        formatted.append(f'{h_open}{title}{h_close}')
+        if paragraphs:
+            formatted.append(_join_paragraphs(paragraphs, p_open, p_close))
 
     return '\n'.join(formatted)
 
 
-def generate_press_release_html(
-    template: str,
+def _press_release_replacements(
     content: Dict,
     folder_name: str,
     jpg_filename: str,
     png_filename: str,
     pdf_filename: str,
-    image_dimensions: tuple,
     config: Dict,
     product_link: str = None,
-    image_url: str = None
-) -> str:
-    """Generate the main press release HTML."""
-    month_folder = generate_month_folder(content.get('date'))
-    base_url = config['urls']['base_url'].format(
-        month_folder=month_folder.replace(' ', '%20'),
-        folder_name=folder_name.replace(' ', '%20')
-    )
+    image_url: str = None,
+    base_url: str = None,
+    month_folder: str = None
+) -> Dict[str, str]:
+    """Placeholder values for the press release page, apart from the image size."""
+    if base_url is None:
+        if month_folder is None:
+            month_folder = generate_month_folder(content.get('date'))
+        base_url = _build_base_url(config, month_folder, folder_name)
 
     jpg_url = image_url if image_url else f"{base_url}{jpg_filename}"
     png_url = f"{base_url}{png_filename}"
@@ -338,62 +514,40 @@ def generate_press_release_html(
     body_html = format_body_paragraphs(content['body_paragraphs'], for_email=False)
     about_html = format_about_sections(content['about_sections'], for_email=False)
 
-    marketing = config['contacts']['marketing']
-    press = config['contacts']['press']
-
-    replacements = {
-        '{{title}}': folder_name,
-        '{{meta_description}}': content.get('meta_description', ''),
-        '{{meta_keywords}}': content.get('meta_keywords', ''),
-        '{{headline}}': content.get('headline', ''),
-        '{{subheadline}}': content.get('subheadline', ''),
-        '{{jpg_url}}': jpg_url,
-        '{{png_url}}': png_url,
-        '{{pdf_url}}': pdf_url,
-        '{{product_link}}': product_link,
-        '{{image_alt}}': content.get('headline', 'Product Image'),
-        '{{image_width}}': str(image_dimensions[0]),
-        '{{image_height}}': str(image_dimensions[1]),
-        '{{body_paragraphs}}': body_html,
-        '{{about_sections}}': about_html,
-        '{{contact_marketing_name}}': marketing['name'],
-        '{{contact_marketing_company}}': marketing['company'],
-        '{{contact_marketing_title}}': marketing['title'],
-        '{{contact_marketing_phone}}': marketing['phone'],
-        '{{contact_marketing_email}}': marketing['email'],
-        '{{contact_press_name}}': press['name'],
-        '{{contact_press_company}}': press['company'],
-        '{{contact_press_title}}': press['title'],
-        '{{contact_press_phone}}': press['phone'],
-        '{{contact_press_email}}': press['email'],
+    return {
+        'title': folder_name,
+        'meta_description': content.get('meta_description', ''),
+        'meta_keywords': content.get('meta_keywords', ''),
+        'headline': content.get('headline', ''),
+        'subheadline': content.get('subheadline', ''),
+        'jpg_url': jpg_url,
+        'png_url': png_url,
+        'pdf_url': pdf_url,
+        'product_link': product_link,
+        'image_alt': content.get('headline', 'Product Image'),
+        'body_paragraphs': body_html,
+        'about_sections': about_html,
     }
 
-    result = template
-    for placeholder, value in replacements.items():
-        result = result.replace(placeholder, value)
-
-    return result
-
 
-def generate_email_html(
-    template: str,
+def _email_replacements(
     content: Dict,
     folder_name: str,
     jpg_filename: str,
     png_filename: str,
     pdf_filename: str,
-    image_dimensions: tuple,
     config: Dict,
     product_link: str = None,
     image_url: str = None,
-    subject: str = None
-) -> str:
-    """Generate the email version HTML."""
-    month_folder = generate_month_folder(content.get('date'))
-    base_url = config['urls']['base_url'].format(
-        month_folder=month_folder.replace(' ', '%20'),
-        folder_name=folder_name.replace(' ', '%20')
-    )
+    subject: str = None,
+    base_url: str = None,
+    month_folder: str = None
+) -> Dict[str, str]:
+    """Placeholder values for the email version, apart from the image size."""
+    if base_url is None:
+        if month_folder is None:
+            month_folder = generate_month_folder(content.get('date'))
+        base_url = _build_base_url(config, month_folder, folder_name)
 
     jpg_url = image_url if image_url else f"{base_url}{jpg_filename}"
     png_url = f"{base_url}{png_filename}"
@@ -410,50 +564,233 @@ def generate_email_html(
     remaining_paragraphs = format_body_paragraphs(paragraphs[1:], for_email=True) if len(paragraphs) > 1 else ''
     about_html = format_about_sections(content['about_sections'], for_email=True)
 
-    marketing = config['contacts']['marketing']
-    press = config['contacts']['press']
-
-    replacements = {
-        '{{title}}': folder_name,
-        '{{subject}}': email_subject,
-        '{{web_version_url}}': web_version_url,
-        '{{headline}}': content.get('headline', ''),
-        '{{subheadline}}': content.get('subheadline', ''),
-        '{{jpg_url}}': jpg_url,
-        '{{png_url}}': png_url,
-        '{{pdf_url}}': pdf_url,
-        '{{product_link}}': product_link,
-        '{{image_alt}}': content.get('headline', 'Product Image'),
-        '{{image_width}}': str(image_dimensions[0]),
-        '{{image_height}}': str(image_dimensions[1]),
-        '{{first_paragraph}}': first_paragraph,
-        '{{remaining_paragraphs}}': remaining_paragraphs,
-        '{{about_sections_email}}': about_html,
-        '{{contact_marketing_name}}': marketing['name'],
-        '{{contact_marketing_company}}': marketing['company'],
-        '{{contact_marketing_title}}': marketing['title'],
-        '{{contact_marketing_phone}}': marketing['phone'],
-        '{{contact_marketing_email}}': marketing['email'],
-        '{{contact_press_name}}': press['name'],
-        '{{contact_press_company}}': press['company'],
-        '{{contact_press_title}}': press['title'],
-        '{{contact_press_phone}}': press['phone'],
-        '{{contact_press_email}}': press['email'],
+    return {
+        'title': folder_name,
+        'subject': email_subject,
+        'web_version_url': web_version_url,
+        'headline': content.get('headline', ''),
+        'subheadline': content.get('subheadline', ''),
+        'jpg_url': jpg_url,
+        'png_url': png_url,
+        'pdf_url': pdf_url,
+        'product_link': product_link,
+        'image_alt': content.get('headline', 'Product Image'),
+        'first_paragraph': first_paragraph,
+        'remaining_paragraphs': remaining_paragraphs,
+        'about_sections_email': about_html,
     }
 
-    result = template
-    for placeholder, value in replacements.items():
-        result = result.replace(placeholder, value)
 
-    return result
+def _render_release(
+    template: str,
+    replacements: Dict[str, str],
+    image_dimensions: tuple,
+    config: Dict
+) -> str:
+    """Render a template with its placeholder values, image size and contacts."""
+    replacements['image_width'] = str(image_dimensions[0])
+    replacements['image_height'] = str(image_dimensions[1])
+
+    template = _bake_contacts(template, _contact_items(config['contacts']))
+    return render_template(template, replacements)
+
+
+def generate_press_release_html(
+    template: str,
+    content: Dict,
+    folder_name: str,
+    jpg_filename: str,
+    png_filename: str,
+    pdf_filename: str,
+    image_dimensions: tuple,
+    config: Dict,
+    product_link: str = None,
+    image_url: str = None,
+    base_url: str = None,
+    month_folder: str = None
+) -> str:
+    """Generate the main press release HTML."""
+    replacements = _press_release_replacements(
+        content,
+        folder_name,
+        jpg_filename,
+        png_filename,
+        pdf_filename,
+        config,
+        product_link=product_link,
+        image_url=image_url,
+        base_url=base_url,
+        month_folder=month_folder
+    )
+    return _render_release(template, replacements, image_dimensions, config)
+
+
+def generate_email_html(
+    template: str,
+    content: Dict,
+    folder_name: str,
+    jpg_filename: str,
+    png_filename: str,
+    pdf_filename: str,
+    image_dimensions: tuple,
+    config: Dict,
+    product_link: str = None,
+    image_url: str = None,
+    subject: str = None,
+    base_url: str = None,
+    month_folder: str = None
+) -> str:
+    """Generate the email version HTML."""
+    replacements = _email_replacements(
+        content,
+        folder_name,
+        jpg_filename,
+        png_filename,
+        pdf_filename,
+        config,
+        product_link=product_link,
+        image_url=image_url,
+        subject=subject,
+        base_url=base_url,
+        month_folder=month_folder
+    )
+    return _render_release(template, replacements, image_dimensions, config)
 
 
 # ============================================================================
 # FTP UPLOAD
 # ============================================================================
 
-def upload_to_ftp(files: List[Dict], config: Dict, folder_name: str, month_folder: str) -> Dict:
-    """Upload files to FTP server."""
+class UploadFile(NamedTuple):
+    """A local file and the name to store it under on the FTP server."""
+    local_path: str
+    remote_filename: str
+
+
+def _as_upload_file(file_info: Union[UploadFile, Dict]) -> UploadFile:
+    """Normalise a {'local_path', 'remote_filename'} dict to an UploadFile."""
+    if isinstance(file_info, UploadFile):
+        return file_info
+    local_path = file_info['local_path']
+    return UploadFile(local_path, file_info.get('remote_filename', os.path.basename(local_path)))
+
+
+# Bytes per send() when sendfile() is unavailable, and the data socket's send buffer
+FTP_BLOCK_SIZE = 1024 * 1024
+FTP_SNDBUF_SIZE = 4 * 1024 * 1024
+
+
+class _TunedFTP(FTP):
+    """FTP client whose data connections use a large send buffer."""
+
+    def ntransfercmd(self, cmd, rest=None):
+        conn, size = super().ntransfercmd(cmd, rest)
+        conn.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, FTP_SNDBUF_SIZE)
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return conn, size
+
+
+def _ftp_make_dirs(ftp: FTP, remote_path: str) -> None:
+    """Create each component of remote_path; existing ones answer MKD with 550."""
+    current = ''
+    for d in remote_path.strip('/').split('/'):
+        current += '/' + d
+        try:
+            ftp.mkd(current)
+        except error_perm as e:
+            if not str(e).startswith('550'):
+                raise
+
+
+def _ftp_connect(ftp_config: Dict) -> FTP:
+    """Open and log in an FTP control connection."""
+    ftp = _TunedFTP()
+    ftp.connect(ftp_config['host'], ftp_config['port'])
+    ftp.login(ftp_config['username'], ftp_config['password'])
+    return ftp
+
+
+def _ftp_store_file(ftp: FTP, remote_file: str, local_path: str) -> None:
+    """STOR one file, handing it to the kernel with sendfile() where available."""
+    if not hasattr(os, 'sendfile'):
+        with open(local_path, 'rb', buffering=FTP_BLOCK_SIZE) as f:
+            ftp.storbinary(f'STOR {remote_file}', f, blocksize=FTP_BLOCK_SIZE)
+        return
+
+    # Same protocol steps as storbinary, minus the user-space copy loop
+    ftp.voidcmd('TYPE I')
+    with open(local_path, 'rb') as f, ftp.transfercmd(f'STOR {remote_file}') as conn:
+        conn.sendfile(f)
+    ftp.voidresp()
+
+
+def _file_size(file_info: UploadFile) -> int:
+    """Local size of a file to upload (0 if it can't be read)."""
+    try:
+        return os.path.getsize(file_info.local_path)
+    except OSError:
+        return 0
+
+
+def _ftp_store_queued(
+    ftp: FTP,
+    remote_path: str,
+    pending: queue.SimpleQueue
+) -> Tuple[int, Optional[Exception]]:
+    """
+    Upload files from a shared queue until it is empty.
+
+    Stops at the first failed transfer. Returns the number of files stored
+    and the error that stopped it, if any.
+    """
+    uploaded = 0
+    while True:
+        try:
+            file_info = pending.get_nowait()
+        except queue.Empty:
+            return uploaded, None
+
+        try:
+            _ftp_store_file(ftp, f"{remote_path}{file_info.remote_filename}", file_info.local_path)
+        except Exception as e:
+            return uploaded, e
+        uploaded += 1
+
+
+def _ftp_upload_worker(
+    ftp_config: Dict,
+    remote_path: str,
+    pending: queue.SimpleQueue
+) -> Tuple[int, Optional[Exception]]:
+    """
+    Drain the upload queue over a dedicated connection of its own.
+
+    A connection the server refuses (e.g. a per-client connection limit)
+    is not an error; the other workers drain the queue instead.
+    """
+    try:
+        ftp = _ftp_connect(ftp_config)
+    except all_errors as e:
+        print(f"Warning: extra FTP connection unavailable: {e}")
+        return 0, None
+    try:
+        return _ftp_store_queued(ftp, remote_path, pending)
+    finally:
+        try:
+            ftp.quit()
+        except all_errors:
+            ftp.close()
+
+
+def upload_to_ftp(files: List[Union[UploadFile, Dict]], config: Dict, folder_name: str, month_folder: str) -> Dict:
+    """
+    Upload files to FTP server.
+
+    FTP serializes transfers on a connection, so up to
+    ftp.parallel_connections sessions each pull files from a shared
+    queue, largest first, until every file is stored. Files may be
+    UploadFile tuples or {'local_path', 'remote_filename'} dicts.
+    """
     ftp_config = config['ftp']
     remote_path = ftp_config['base_remote_path'].format(
         month_folder=month_folder,
@@ -463,33 +800,42 @@ def upload_to_ftp(files: List[Dict], config: Dict, folder_name: str, month_folde
     result = {'success': False, 'error': None, 'uploaded': 0}
 
     try:
-        ftp = FTP()
-        ftp.connect(ftp_config['host'], ftp_config['port'])
-        ftp.login(ftp_config['username'], ftp_config['password'])
+        ftp = _ftp_connect(ftp_config)
 
         # Create directory structure
-        dirs = remote_path.strip('/').split('/')
-        current = ''
-        for d in dirs:
-            current += '/' + d
-            try:
-                ftp.cwd(current)
-            except:
-                ftp.mkd(current)
-
-        ftp.cwd('/')
-
-        # Upload files
-        for file_info in files:
-            local_path = file_info['local_path']
-            remote_filename = file_info.get('remote_filename', os.path.basename(local_path))
-            full_remote = f"{remote_path}{remote_filename}"
-
-            with open(local_path, 'rb') as f:
-                ftp.storbinary(f'STOR {full_remote}', f)
-            result['uploaded'] += 1
-
-        ftp.quit()
+        _ftp_make_dirs(ftp, remote_path)
+
+        # Upload files; the first worker reuses the connection opened above
+        pending = queue.SimpleQueue()
+        upload_files = [_as_upload_file(file_info) for file_info in files]
+        for file_info in sorted(upload_files, key=_file_size, reverse=True):
+            pending.put(file_info)
+
+        workers = max(1, min(ftp_config.get('parallel_connections', 1), len(files)))
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_ftp_store_queued, ftp, remote_path, pending)]
+            futures += [
+                executor.submit(_ftp_upload_worker, ftp_config, remote_path, pending)
+                for _ in range(workers - 1)
+            ]
+            errors = []
+            for future in as_completed(futures):
+                uploaded, error = future.result()
+                result['uploaded'] += uploaded
+                if error is not None:
+                    errors.append(error)
+
+        try:
+            ftp.quit()
+        except all_errors:
+            ftp.close()
+
+        if errors:
+            raise errors[0]
+        if not pending.empty():
+            raise RuntimeError(f"{pending.qsize()} file(s) were not uploaded")
+
         result['success'] = True
 
     except Exception as e:
@@ -502,6 +848,9 @@ def upload_to_ftp(files: List[Dict], config: Dict, folder_name: str, month_folde
 # MAIN PROCESSING
 # ============================================================================
 
+_RELEASE_EXTENSIONS = frozenset({'docx', 'png', 'pdf'})
+
+
 def find_files(folder_path: str) -> Dict:
     """Find required files in the press release folder."""
     files = {
@@ -511,35 +860,103 @@ def find_files(folder_path: str) -> Dict:
         'folder_name': os.path.basename(folder_path)
     }
 
-    for filename in os.listdir(folder_path):
-        filepath = os.path.join(folder_path, filename)
-        if not os.path.isfile(filepath):
-            continue
+    # scandir's entries carry the file type, so no extra stat per file
+    with os.scandir(folder_path) as entries:
+        for entry in entries:
+            name = entry.name
+            _, dot, ext = name.rpartition('.')
+            ext = ext.lower()
+            if not dot or ext not in _RELEASE_EXTENSIONS or not entry.is_file():
+                continue
 
-        lower = filename.lower()
+            if ext == 'png':
+                files['png'] = entry.path
+                continue
 
-        if lower.endswith('.docx') and 'instruction' not in lower:
-            if files['docx'] is None or 'publicrelations' in lower:
-                files['docx'] = filepath
+            # Only docx/pdf selection looks at the rest of the name
+            lower = name.lower()
 
-        elif lower.endswith('.png'):
-            files['png'] = filepath
+            if ext == 'docx':
+                if 'instruction' not in lower:
+                    if files['docx'] is None or 'publicrelations' in lower:
+                        files['docx'] = entry.path
 
-        elif lower.endswith('.pdf'):
-            if 'instruction' not in lower and 'order' not in lower:
+            elif 'instruction' not in lower and 'order' not in lower:
                 if files['pdf'] is None or 'publicrelations' in lower:
-                    files['pdf'] = filepath
+                    files['pdf'] = entry.path
 
     return files
 
 
+def _jpg_path_for(png_path: str) -> str:
+    """Path of the JPG generated next to a PNG."""
+    return f"{os.path.splitext(png_path)[0]}.jpg"
+
+
+def _convert_image(png_path: str, config: Dict) -> Dict:
+    """Convert a PNG to its JPG using the configured image settings."""
+    image_settings = config['image_settings']
+    return convert_png_to_jpg(
+        png_path,
+        _jpg_path_for(png_path),
+        target_width=image_settings['output_width'],
+        jpeg_quality=image_settings['jpeg_quality'],
+        jpeg_optimize=image_settings.get('jpeg_optimize', True)
+    )
+
+
+def _convert_image_after(previous: Future, png_path: str, config: Dict) -> Dict:
+    """Convert a PNG again once an earlier conversion of it has finished."""
+    previous.result()
+    return _convert_image(png_path, config)
+
+
+def _write_html(path: str, html: str) -> None:
+    """Write generated HTML as UTF-8 through a buffered file, which writes it fully."""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(html)
+
+
+def _start_processing(downloads: Iterable[str], config: Dict) -> Dict[str, Future]:
+    """
+    Parse Word documents and convert PNGs as their downloads complete.
+
+    Work starts on every candidate file; find_files picks the ones actually
+    used once the folder is complete. Returns futures keyed by local path.
+    """
+    executor = ThreadPoolExecutor(max_workers=2)
+    prepared = {}
+    downloaded = set()
+    try:
+        for local_path in downloads:
+            downloaded.add(local_path)
+            lower = os.path.basename(local_path).lower()
+            if lower.endswith('.docx') and 'instruction' not in lower:
+                prepared[local_path] = executor.submit(parse_docx, local_path)
+            elif lower.endswith('.png'):
+                prepared[local_path] = executor.submit(_convert_image, local_path, config)
+
+        # A downloaded <stem>.jpg can land on top of an early conversion;
+        # convert those PNGs again now that the folder is complete
+        for local_path, future in list(prepared.items()):
+            if local_path.lower().endswith('.png') and _jpg_path_for(local_path) in downloaded:
+                prepared[local_path] = executor.submit(
+                    _convert_image_after, future, local_path, config
+                )
+    finally:
+        executor.shutdown(wait=False)
+
+    return prepared
+
+
 def process_press_release(
     folder_path: str,
     press_release_template: str,
     email_template: str,
     image_url: str = None,
     subject: str = None,
-    config: Dict = None
+    config: Dict = None,
+    downloads: Optional[Iterable[str]] = None
 ) -> Dict:
     """
     Process a press release folder and generate HTML files.
@@ -551,6 +968,9 @@ def process_press_release(
         image_url: Optional tracking URL for embedded image
         subject: Optional email subject line
         config: Optional config dict (uses DEFAULT_CONFIG if not provided)
+        downloads: Optional iterable of local paths still being downloaded
+            into folder_path; parsing and image conversion start as each
+            file arrives (download errors propagate)
 
     Returns:
         Dictionary with processing results
@@ -566,6 +986,8 @@ def process_press_release(
         'month_folder': None
     }
 
+    prepared = _start_processing(downloads, config) if downloads is not None else {}
+
     # Validate folder exists
     if not os.path.isdir(folder_path):
         result['errors'].append(f"Folder not found: {folder_path}")
@@ -588,31 +1010,25 @@ def process_press_release(
         result['errors'].append(f"Missing files: {', '.join(missing)}")
         return result
 
+    # Convert the image in the background while the document is parsed
+    # and the HTML rendered; only the final dimensions depend on it
+    if files['png'] not in prepared:
+        executor = ThreadPoolExecutor(max_workers=1)
+        prepared[files['png']] = executor.submit(_convert_image, files['png'], config)
+        executor.shutdown(wait=False)
+
     # Parse Word document
     try:
-        content = parse_docx(files['docx'])
+        if files['docx'] in prepared:
+            content = prepared[files['docx']].result()
+        else:
+            content = parse_docx(files['docx'])
     except Exception as e:
         result['errors'].append(f"Failed to parse Word document: {e}")
         return result
 
-    # Process image
-    png_basename = os.path.splitext(os.path.basename(files['png']))[0]
-    jpg_path = os.path.join(folder_path, f"{png_basename}.jpg")
-
-    img_result = convert_png_to_jpg(
-        files['png'],
-        jpg_path,
-        target_width=config['image_settings']['output_width'],
-        jpeg_quality=config['image_settings']['jpeg_quality']
-    )
-
-    if not img_result['success']:
-        result['errors'].append(f"Failed to process image: {img_result['error']}")
-        return result
-
-    image_dimensions = img_result['dimensions']
-
-    # Generate HTML files
+    # Prepare the HTML placeholder values; only the image size waits on the conversion
+    jpg_path = _jpg_path_for(files['png'])
     jpg_filename = os.path.basename(jpg_path)
     png_filename = os.path.basename(files['png'])
     pdf_filename = os.path.basename(files['pdf'])
@@ -622,43 +1038,64 @@ def process_press_release(
 
     product_link = content.get('product_link', '#')
 
+    result['month_folder'] = generate_month_folder(content.get('date'))
+    base_url = _build_base_url(config, result['month_folder'], folder_name)
+
+    html_error = None
     try:
-        # Generate main press release HTML
-        press_release_html = generate_press_release_html(
-            press_release_template,
+        press_release_replacements = _press_release_replacements(
             content,
             folder_name,
             jpg_filename,
             png_filename,
             pdf_filename,
-            image_dimensions,
             config,
             product_link=product_link,
-            image_url=image_url
+            image_url=image_url,
+            base_url=base_url
         )
-
-        html_path = os.path.join(folder_path, html_filename)
-        with open(html_path, 'w', encoding='utf-8') as f:
-            f.write(press_release_html)
-
-        # Generate email HTML
-        email_html = generate_email_html(
-            email_template,
+        email_replacements = _email_replacements(
             content,
             folder_name,
             jpg_filename,
             png_filename,
             pdf_filename,
-            image_dimensions,
             config,
             product_link=product_link,
             image_url=image_url,
-            subject=subject
+            subject=subject,
+            base_url=base_url
+        )
+    except Exception as e:
+        html_error = e
+
+    # Process image
+    img_result = prepared[files['png']].result()
+
+    if not img_result['success']:
+        result['errors'].append(f"Failed to process image: {img_result['error']}")
+        return result
+
+    # Generate HTML files
+    try:
+        if html_error:
+            raise html_error
+
+        image_dimensions = img_result['dimensions']
+
+        # Generate main press release HTML
+        press_release_html = _render_release(
+            press_release_template, press_release_replacements, image_dimensions, config
         )
+        html_path = os.path.join(folder_path, html_filename)
+        _write_html(html_path, press_release_html)
 
+        # Generate email HTML
+        email_html = _render_release(
+            email_template, email_replacements, image_dimensions, config
+        )
         email_path = os.path.join(folder_path, email_filename)
-        with open(email_path, 'w', encoding='utf-8') as f:
-            f.write(email_html)
+        _write_html(email_path, email_html)
 
     except Exception as e:
         result['errors'].append(f"Failed to generate HTML: {e}")
@@ -666,20 +1103,14 @@ def process_press_release(
 
     # Build file list for upload
     result['files_to_upload'] = [
-        {'local_path': html_path, 'remote_filename': html_filename},
-        {'local_path': email_path, 'remote_filename': email_filename},
-        {'local_path': jpg_path, 'remote_filename': jpg_filename},
-        {'local_path': files['png'], 'remote_filename': png_filename},
-        {'local_path': files['pdf'], 'remote_filename': pdf_filename},
+        UploadFile(html_path, html_filename),
+        UploadFile(email_path, email_filename),
+        UploadFile(jpg_path, jpg_filename),
+        UploadFile(files['png'], png_filename),
+        UploadFile(files['pdf'], pdf_filename),
     ]
 
-    result['month_folder'] = generate_month_folder(content.get('date'))
-
     # Generate preview URLs
-    base_url = config['urls']['base_url'].format(
-        month_folder=result['month_folder'].replace(' ', '%20'),
-        folder_name=folder_name.replace(' ', '%20')
-    )
     result['preview_urls'] = {
         'html': f"{base_url}{html_filename}",
         'email': f"{base_url}{email_filename}"
@@ -5,6 +5,11 @@ import os
 import requests
 from typing import Optional
 
+SLACK_TIMEOUT = 10
+
+# Shared session so repeated notifications reuse the HTTPS connection
+_session = requests.Session()
+
 
 def send_slack_notification(
     message: str,
@@ -32,7 +37,7 @@ def send_slack_notification(
         payload["blocks"] = blocks
 
     try:
-        response = requests.post(webhook_url, json=payload)
+        response = _session.post(webhook_url, json=payload, timeout=SLACK_TIMEOUT)
         response.raise_for_status()
         return True
     except Exception as e: